@@ -1,17 +1,26 @@
+import contextlib
 import os
 import uvicorn
 from google.adk.cli.fast_api import get_fast_api_app
+from sample_agent import root_agent
 
 AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
 SESSION_DB_URL = "sqlite:///memory.db"
 ALLOWED_ORIGINS = ["http://localhost", "http://localhost:8080", "*"]
 SERVE_WEB_INTERFACE = True
 
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    # Close the model's pooled HTTP client on shutdown
+    await root_agent.model.aclose()
+
 app = get_fast_api_app(
     agents_dir=AGENT_DIR,
     session_service_uri=SESSION_DB_URL,
     allow_origins=ALLOWED_ORIGINS,
     web=SERVE_WEB_INTERFACE,
+    lifespan=lifespan,
 )
 
 if __name__ == "__main__":
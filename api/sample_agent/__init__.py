@@ -1,6 +1,12 @@
 """Sample agent package for Google ADK with Transformers integration."""
 
+import inspect
+
 from .transformers_llm import TransformersLlm
-from .agent import root_agent
+from .agent import get_current_time, get_weather, root_agent, time_tool, weather_tool
+
+# Coroutine tools are awaited inline by ADK instead of being sent to a thread
+assert inspect.iscoroutinefunction(get_weather)
+assert inspect.iscoroutinefunction(get_current_time)
 
-__all__ = ['TransformersLlm', 'root_agent']
\ No newline at end of file
+__all__ = ['TransformersLlm', 'root_agent', 'weather_tool', 'time_tool']
\ No newline at end of file
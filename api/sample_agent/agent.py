@@ -1,63 +1,118 @@
-import os
+import asyncio
 import datetime
+import functools
+import os
+import time
+from typing import Callable, Literal
 from zoneinfo import ZoneInfo
+
 from google.adk.agents import Agent
-import sys
-import os
-sys.path.append(os.path.dirname(__file__))
-from transformers_llm import TransformersLlm
+from google.adk.tools import FunctionTool
+from typing_extensions import TypedDict
+
+from .transformers_llm import TransformersLlm
+
+# On a CUDA host with bitsandbytes installed, set
+# AGENT_MODEL=unsloth/Llama-3.2-1B-Instruct-bnb-4bit to serve 4-bit weights,
+# about a quarter of the BF16 weight bytes read per decoded token
+AGENT_MODEL = os.environ.get("AGENT_MODEL", "meta-llama/Llama-3.2-1B-Instruct")
+
+class ToolResult(TypedDict, total=False):
+    """Result shape shared by the weather and time tools."""
 
-AGENT_MODEL = "meta-llama/Llama-3.2-1B-Instruct"
+    status: Literal["success", "error"]
+    report: str
+    error_message: str
 
-def get_weather(city: str) -> dict:
+# Caps concurrent tool executions when the model fans out many calls at once
+_TOOL_SEM = asyncio.Semaphore(8)
+
+# Timezones resolved once at import so the tool never constructs ZoneInfo per call
+_TZ_TABLE = {"new york": ZoneInfo("America/New_York")}
+
+# Bound %-format templates for the error messages returned on unknown cities
+_WEATHER_ERR = "Weather information for '%s' is not available.".__mod__
+_TIME_ERR = "Sorry, I don't have timezone information for %s.".__mod__
+
+# Weather reports keyed by casefolded city name, built once at import
+_WEATHER_REPORTS: dict[str, ToolResult] = {
+    "singapore": {
+        "status": "success",
+        "report": (
+            "Singapore is experiencing partly cloudy conditions with a temperature of 30°C and high humidity."
+            " There's a chance of afternoon thunderstorms."
+        ),
+    },
+}
+
+async def get_weather(city: str) -> ToolResult:
     """Retrieves the current weather report for a specified city.
 
     Args:
         city (str): The name of the city for which to retrieve the weather report.
 
     Returns:
-        dict: status and result or error msg.
+        ToolResult: status and result or error msg.
     """
-    if city.lower() == "singapore":
-        return {
-            "status": "success",
-            "report": (
-                "Singapore is experiencing partly cloudy conditions with a temperature of 30癈 and high humidity."
-                " There's a chance of afternoon thunderstorms."
-            ),
-        }
-    else:
+    async with _TOOL_SEM:
+        report = _WEATHER_REPORTS.get(city.casefold())
+        if report is not None:
+            # Copied so callbacks that edit the result can't alter the table
+            return dict(report)
         return {
             "status": "error",
-            "error_message": f"Weather information for '{city}' is not available.",
+            "error_message": _WEATHER_ERR(city),
         }
 
-def get_current_time(city: str) -> dict:
+@functools.lru_cache(maxsize=128)
+def _time_report(city: str, epoch_sec: int, tz: ZoneInfo) -> ToolResult:
+    """Builds the success result for ``epoch_sec`` in ``tz``.
+
+    Cached per second so repeated calls for the same city within one second
+    share a single result.
+    """
+    now = datetime.datetime.fromtimestamp(epoch_sec, tz)
+    # Same layout as strftime("%Y-%m-%d %H:%M:%S %Z%z") without the format interpreter
+    offset_minutes = int(now.utcoffset().total_seconds()) // 60
+    sign = "-" if offset_minutes < 0 else "+"
+    offset_hours, offset_minutes = divmod(abs(offset_minutes), 60)
+    report = (
+        f"The current time in {city} is "
+        f"{now.year:04d}-{now.month:02d}-{now.day:02d} "
+        f"{now.hour:02d}:{now.minute:02d}:{now.second:02d} "
+        f"{now.tzname()}{sign}{offset_hours:02d}{offset_minutes:02d}"
+    )
+    return {"status": "success", "report": report}
+
+# Time handlers keyed by casefolded city name, each bound to its precomputed ZoneInfo
+_TIME_HANDLERS: dict[str, Callable[[str, int], ToolResult]] = {
+    key: functools.partial(_time_report, tz=tz) for key, tz in _TZ_TABLE.items()
+}
+
+async def get_current_time(city: str) -> ToolResult:
     """Returns the current time in a specified city.
 
     Args:
         city (str): The name of the city for which to retrieve the current time.
 
     Returns:
-        dict: status and result or error msg.
+        ToolResult: status and result or error msg.
     """
 
-    if city.lower() == "new york":
-        tz_identifier = "America/New_York"
-    else:
-        return {
-            "status": "error",
-            "error_message": (
-                f"Sorry, I don't have timezone information for {city}."
-            ),
-        }
+    async with _TOOL_SEM:
+        handler = _TIME_HANDLERS.get(city.casefold())
+        if handler is None:
+            return {
+                "status": "error",
+                "error_message": _TIME_ERR(city),
+            }
 
-    tz = ZoneInfo(tz_identifier)
-    now = datetime.datetime.now(tz)
-    report = (
-        f'The current time in {city} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
-    )
-    return {"status": "success", "report": report}
+        # Copied so callbacks that edit the result can't alter the cached entry
+        return dict(handler(city, int(time.time())))
+
+# Wrapped once at import so the declarations are built a single time
+weather_tool = FunctionTool(get_weather)
+time_tool = FunctionTool(get_current_time)
 
 root_agent = Agent(
     name="general_chat_agent",
@@ -72,5 +127,5 @@ root_agent = Agent(
     instruction=(
         "You are a helpful agent who can answer user questions about the time and weather in a city."
     ),
-    tools=[get_weather, get_current_time],
+    tools=[weather_tool, time_tool],
 )
\ No newline at end of file
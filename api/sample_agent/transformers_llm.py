@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import enum
+import itertools
 import json
 import logging
-import requests
-from typing import AsyncGenerator, Optional, Any, Dict, List
-from functools import cached_property
+import re
+from typing import AsyncGenerator, Iterator, Optional, Any, Dict, List, Sequence
+from functools import cached_property, lru_cache
 
+import httpx
 import openai
 from google.genai import types
 from typing_extensions import override
@@ -17,8 +21,162 @@ from google.adk.models.base_llm import BaseLlm
 from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser when orjson is unavailable
+    orjson = None
+
 logger = logging.getLogger("google_adk." + __name__)
 
+# Keywords in the latest message that suggest the query needs tools
+_FUNCTION_TRIGGER = re.compile(r"weather|time|temperature|forecast|clock", re.IGNORECASE)
+
+# Openings of a reply that is a function call written out as JSON text
+_FUNCTION_CALL_MARKERS = ('{"name"', '{"type"')
+_FUNCTION_CALL_MARKER_LEN = max(map(len, _FUNCTION_CALL_MARKERS))
+
+# Transformers finish reasons mapped to ADK finish reasons
+_FINISH_REASON_MAP = {
+    "stop": types.FinishReason.STOP,
+    "length": types.FinishReason.MAX_TOKENS,
+    "tool_calls": types.FinishReason.STOP,
+    "content_filter": types.FinishReason.SAFETY,
+}
+_FINISH_REASON_DEFAULT = types.FinishReason.FINISH_REASON_UNSPECIFIED
+
+# Process-wide source of ids for function calls parsed out of plain text
+_CALL_ID = itertools.count(1)
+
+# Returned by anext() once the completion stream is exhausted
+_STREAM_END = object()
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def _json_dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+    def _json_dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
+
+
+# Lowercased JSON schema type names, memoized per schema type value
+_TYPE_NAME_CACHE: Dict[Any, str] = {}
+
+
+def _type_name(schema_type: Any) -> str:
+    """Returns the lowercased JSON schema name for a schema type."""
+    name = _TYPE_NAME_CACHE.get(schema_type)
+    if name is None:
+        name = schema_type.value.lower() if isinstance(
+            schema_type, enum.Enum) else str(schema_type).lower()
+        _TYPE_NAME_CACHE[schema_type] = name
+    return name
+
+
+def _safe_json_args(arguments: Optional[str]) -> Dict[str, Any]:
+    """Decodes tool-call arguments, returning {} unless they hold a JSON object."""
+    if not arguments or arguments.lstrip()[:1] != '{':
+        return {}
+    try:
+        args = _json_loads(arguments)
+    except json.JSONDecodeError:
+        return {}
+    return args if isinstance(args, dict) else {}
+
+
+def _system_message(instruction: Any) -> Dict[str, Any]:
+    """Returns the system message for ``instruction``, shared per instruction string."""
+    if isinstance(instruction, str):
+        return _cached_system_message(instruction)
+    return {"role": "system", "content": instruction}
+
+
+@lru_cache(maxsize=16)
+def _cached_system_message(instruction: str) -> Dict[str, Any]:
+    return {"role": "system", "content": instruction}
+
+
+# Role shared by every streamed Content (identifier-like literals are already interned)
+_MODEL_ROLE = "model"
+
+
+def _make_content(parts: List[types.Part]) -> types.Content:
+    """Builds a model-role Content around already-valid parts without validation."""
+    return types.Content.model_construct(role=_MODEL_ROLE, parts=parts)
+
+
+def _encode_data_url(mime: str, data: bytes) -> str:
+    """Encodes binary data as a base64 ``data:`` URL."""
+    return "data:%s;base64,%s" % (mime, base64.b64encode(data).decode('ascii'))
+
+
+# Largest payload kept by the encoding cache, which bounds it to about
+# 32 * 256 KiB of raw bytes plus their base64 form
+_INLINE_CACHE_MAX_BYTES = 256 * 1024
+
+
+def _convert_inline_data(mime_type: str, data: bytes) -> Optional[Dict[str, Any]]:
+    """Converts an inline image/audio blob to a Transformers content part."""
+    if len(data) > _INLINE_CACHE_MAX_BYTES:
+        return _encode_inline_data(mime_type, data)
+    return _cached_inline_data(mime_type, data)
+
+
+# Persisted sessions (main.py uses sqlite) rebuild the bytes on every turn,
+# so a hit costs a full hash and compare of the payload; that is only worth
+# it for small blobs such as icons or short clips resent across turns.
+@lru_cache(maxsize=32)
+def _cached_inline_data(mime_type: str, data: bytes) -> Optional[Dict[str, Any]]:
+    return _encode_inline_data(mime_type, data)
+
+
+def _encode_inline_data(mime_type: str, data: bytes) -> Optional[Dict[str, Any]]:
+    if mime_type.startswith("image"):
+        # Handle image data
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": _encode_data_url(mime_type, data)
+            }
+        }
+    elif mime_type.startswith("audio"):
+        # Handle audio data (for models that support it)
+        return {
+            "type": "input_audio",
+            "input_audio": {
+                "data": base64.b64encode(data).decode('ascii'),
+                "format": mime_type.split("/")[-1]
+            }
+        }
+    return None
+
+
+async def _aiter_byte_lines(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+    """Yields the raw lines of a streamed response body without decoding them."""
+    # Fragments of the current line, joined once its newline arrives
+    pending: List[bytes] = []
+    async for chunk in response.aiter_bytes():
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            continue
+        lines = chunk.split(b"\n")
+        pending.append(lines[0])
+        yield b"".join(pending)
+        for line in lines[1:-1]:
+            yield line
+        pending = [lines[-1]]
+    tail = b"".join(pending)
+    if tail:
+        yield tail
+
 
 class TransformersLlm(BaseLlm):
     """Transformers integration for Hugging Face models.
@@ -34,6 +192,18 @@ class TransformersLlm(BaseLlm):
         organization: Organization ID (optional).
         max_retries: Maximum number of retries for API calls (default: 3).
         timeout: Request timeout in seconds (default: 60).
+        max_concurrent_requests: Maximum number of in-flight requests shared
+            across all sessions using this model (default: 8). A permit is
+            released before the final response is yielded, so tool calls and
+            nested model calls made in between don't hold one.
+        stream_batch_size: Maximum number of streamed tokens coalesced into
+            one partial response (default: 8).
+        stream_batch_interval: Maximum seconds to hold streamed tokens before
+            yielding them, even while the server pauses; the first visible
+            text is yielded at once (default: 0.01).
+        optimize_latency: How aggressively responses are coalesced. 0 keeps
+            the regular streaming behaviour; 2 or higher collapses replies to
+            requests without tools into a single response (default: 0).
     """
 
     api_key: Optional[str] = None
@@ -41,19 +211,32 @@ class TransformersLlm(BaseLlm):
     organization: Optional[str] = None
     max_retries: int = 3
     timeout: float = 60.0
+    max_concurrent_requests: int = 8
+    stream_batch_size: int = 8
+    stream_batch_interval: float = 0.01
+    optimize_latency: int = 0
 
     @classmethod
     @override
+    @lru_cache(maxsize=1)
     def supported_models(cls) -> list[str]:
-        """Returns regex patterns for supported Transformers models."""
+        """Returns regex patterns for supported Transformers models.
+
+        There is no catch-all pattern, so registering this class doesn't
+        shadow other backends; subclass and override to match any model name.
+        """
         return [
             r"deepseek-ai/.*",
             r"meta-llama/.*",
             r"mistralai/.*",
             r"unsloth/.*",
-            r".*"  # Support any model when using custom endpoints
         ]
 
+    @classmethod
+    def supported_models_strict(cls, extra: Sequence[str] = ()) -> list[str]:
+        """Returns the explicit supported patterns merged with ``extra`` patterns."""
+        return [*cls.supported_models(), *extra]
+
     @cached_property
     def _transformers_client(self) -> openai.AsyncOpenAI:
         """Creates and caches the Transformers async client."""
@@ -71,8 +254,37 @@ class TransformersLlm(BaseLlm):
         if self.organization:
             kwargs["organization"] = self.organization
 
+        # Share the pooled transport with the raw HTTP path
+        kwargs["http_client"] = self._http_client
+
         return openai.AsyncOpenAI(**kwargs)
 
+    @cached_property
+    def _http_client(self) -> httpx.AsyncClient:
+        """Creates and caches the pooled HTTP client shared by all requests."""
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_keepalive_connections=64,
+                max_connections=128,
+                keepalive_expiry=30.0,
+            ),
+            http2=True,
+        )
+
+    async def aclose(self) -> None:
+        """Closes the pooled HTTP client if it has been created."""
+        # Drop the SDK client too, since it wraps the transport being closed
+        self.__dict__.pop("_transformers_client", None)
+        http_client = self.__dict__.pop("_http_client", None)
+        if http_client is not None:
+            await http_client.aclose()
+
+    @cached_property
+    def _request_semaphore(self) -> asyncio.Semaphore:
+        """Creates and caches the semaphore bounding concurrent requests."""
+        return asyncio.Semaphore(self.max_concurrent_requests)
+
     @override
     async def generate_content_async(
         self, llm_request: LlmRequest, stream: bool = False
@@ -89,21 +301,16 @@ class TransformersLlm(BaseLlm):
         # Ensure there's user content for the model to respond to
         self._maybe_append_user_content(llm_request)
 
-        logger.debug(f"Transformers request for model: {self.model}")
+        logger.debug("Transformers request for model: %s", self.model)
 
         try:
             # Convert ADK request to Transformers API format
             messages = self._convert_contents_to_messages(llm_request.contents)
 
             # Add system instruction if present
-            if llm_request.config.system_instruction:
-                messages.insert(0, {
-                    "role": "system",
-                    "content": llm_request.config.system_instruction
-                })
-
-            # Convert tools if present
-            tools = self._convert_tools(llm_request)
+            system_instruction = llm_request.config.system_instruction
+            if system_instruction:
+                messages = [_system_message(system_instruction), *messages]
 
             # Prepare Transformers API parameters
             api_params = {
@@ -112,47 +319,64 @@ class TransformersLlm(BaseLlm):
                 "stream": stream,
             }
 
-            # Add tools only if the query seems to require them AND no function responses are present
-            if tools:
-                # Check if there are function responses in the conversation
-                has_function_responses = any(
-                    msg.get("role") == "tool" for msg in messages
-                )
-
-                if has_function_responses:
-                    logger.debug(
-                        "Function responses present - not including tools to allow natural language response")
-                else:
-                    last_message = messages[-1] if messages else {}
-                    content = last_message.get("content", "").lower()
+            # Add tools only if the query seems to require them AND no function responses are present.
+            # The heuristic runs first so tool schemas are only converted when they will be sent.
+            if not llm_request.config.tools:
+                logger.debug("No tools available for this request")
+            elif any(msg.get("role") == "tool" for msg in messages):
+                logger.debug(
+                    "Function responses present - not including tools to allow natural language response")
+            else:
+                last_message = messages[-1] if messages else {}
+                content = last_message.get("content", "")
 
-                    # Only include tools for queries that seem to need them
-                    if any(keyword in content for keyword in ["weather", "time", "temperature", "forecast", "clock"]):
+                # Only include tools for queries that seem to need them
+                if isinstance(content, str) and _FUNCTION_TRIGGER.search(content):
+                    tools = self._convert_tools(llm_request)
+                    if tools:
                         logger.debug(
-                            f"Adding {len(tools)} tools to request for function-related query")
+                            "Adding %d tools to request for function-related query", len(tools))
                         api_params["tools"] = tools
                         api_params["tool_choice"] = "auto"
                     else:
-                        logger.debug(
-                            "Not including tools for non-function query to prevent unwanted function calls")
-            else:
-                logger.debug("No tools available for this request")
+                        logger.debug("No tools available for this request")
+                else:
+                    logger.debug(
+                        "Not including tools for non-function query to prevent unwanted function calls")
 
             # Add generation parameters from config
             self._add_generation_params(api_params, llm_request.config)
 
-            logger.debug(
-                f"Transformers API params: {json.dumps(api_params, indent=2, default=str)}")
-
-            if stream:
-                async for response_chunk in self._stream_completion(api_params):
-                    yield response_chunk
-            else:
-                # For non-streaming, use raw HTTP to handle server's buggy streaming response
-                api_params["stream"] = False
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
-                    "Using raw HTTP request for async non-streaming to handle potential streaming response")
-                response = await self._make_raw_http_request_async(api_params)
+                    "Transformers API params: %s", _json_dumps_pretty(api_params))
+
+            # The caller runs tools and sub-agents while this generator is
+            # suspended on a terminal response, so only partial text is yielded
+            # under the permit; everything from the first terminal response on
+            # is held until the request itself has finished.
+            held_responses: List[LlmResponse] = []
+            async with self._request_semaphore:
+                if self.optimize_latency >= 2 and "tools" not in api_params:
+                    # Plain text reply requested: skip per-chunk responses entirely
+                    held_responses.append(
+                        await self._generate_content_text(api_params))
+                else:
+                    if stream:
+                        responses = self._stream_completion(api_params)
+                    else:
+                        # For non-streaming, use raw HTTP to handle server's buggy streaming response
+                        api_params["stream"] = False
+                        logger.debug(
+                            "Using raw HTTP request for async non-streaming to handle potential streaming response")
+                        responses = self._make_raw_http_request_async(api_params)
+                    async for response in responses:
+                        if response.partial and not held_responses:
+                            yield response
+                        else:
+                            held_responses.append(response)
+
+            for response in held_responses:
                 yield response
 
         except Exception as e:
@@ -162,24 +386,22 @@ class TransformersLlm(BaseLlm):
                 error_message=str(e)
             )
 
-    def _parse_raw_streaming_response(self, response_text: str, has_function_responses: bool = False) -> LlmResponse:
-        """Parse raw streaming response text into clean content."""
-        content_parts = []
-
-        for line in response_text.split('\n'):
-            line = line.strip()
-            if line.startswith('data: '):
-                try:
-                    data = json.loads(line[6:])  # Remove 'data: ' prefix
-                    if 'choices' in data and len(data['choices']) > 0:
-                        choice = data['choices'][0]
-                        if 'delta' in choice and 'content' in choice['delta']:
-                            content = choice['delta']['content']
-                            if content:
-                                content_parts.append(content)
-                except json.JSONDecodeError:
-                    continue
+    def _parse_raw_streaming_line(self, line: bytes) -> Optional[str]:
+        """Extract the content delta from a single raw SSE line, if any."""
+        if not line.startswith(b'data: '):
+            return None
+        try:
+            data = _json_loads(line[6:])  # Remove 'data: ' prefix
+        except json.JSONDecodeError:
+            return None
+        if 'choices' in data and len(data['choices']) > 0:
+            choice = data['choices'][0]
+            if 'delta' in choice and 'content' in choice['delta']:
+                return choice['delta']['content'] or None
+        return None
 
+    def _parse_raw_streaming_response(self, content_parts: List[str], has_function_responses: bool = False) -> LlmResponse:
+        """Build the final response from the content deltas of a raw SSE stream."""
         # Join all content parts
         full_content = ''.join(content_parts)
 
@@ -246,7 +468,7 @@ class TransformersLlm(BaseLlm):
                 for tool_call in tool_calls:
                     try:
                         func_name = tool_call['function']['name']
-                        func_args = json.loads(
+                        func_args = _json_loads(
                             tool_call['function']['arguments']) if tool_call['function']['arguments'] else {}
 
                         part = types.Part.from_function_call(
@@ -296,98 +518,105 @@ class TransformersLlm(BaseLlm):
                 "Function call conversion disabled - treating as regular text")
             return None
 
-        # Don't convert if the content looks like natural language rather than JSON
-        content_stripped = content.strip()
-        if not (content_stripped.startswith('{') and content_stripped.endswith('}')):
+        # Don't convert if the content looks like natural language rather than JSON;
+        # checking the first character avoids stripping text that can't be an object
+        if not content or (content[0] != '{' and content.lstrip()[:1] != '{'):
             logger.debug(
                 "Content doesn't look like JSON - treating as regular text")
             return None
 
-        try:
-            content = content.strip()
+        content = content.strip()
+        if not content.endswith('}'):
+            logger.debug(
+                "Content doesn't look like JSON - treating as regular text")
+            return None
 
+        try:
             # Try to parse as JSON
-            if content.startswith('{') and content.endswith('}'):
-                data = json.loads(content)
+            data = _json_loads(content)
 
-                # Check if it looks like a function call with "type": "function" format
-                if data.get('type') == 'function' and 'function' in data and 'parameters' in data:
-                    func_name = data['function']
-                    func_args = data['parameters'] if isinstance(
-                        data['parameters'], dict) else {}
+            # Check if it looks like a function call with "type": "function" format
+            if data.get('type') == 'function' and 'function' in data and 'parameters' in data:
+                func_name = data['function']
+                func_args = data['parameters'] if isinstance(
+                    data['parameters'], dict) else {}
 
-                    part = types.Part.from_function_call(
-                        name=func_name,
-                        args=func_args
-                    )
-                    if part.function_call:
-                        part.function_call.id = f"call_{hash(content) % 10000}"
-                    logger.debug(
-                        f"Converted type:function text to proper function call: {func_name}")
-                    return part
-
-                # Check if it looks like a simple function call with "name" and "parameters"
-                elif 'name' in data and 'parameters' in data:
-                    func_name = data['name']
-                    func_args = data['parameters'] if isinstance(
-                        data['parameters'], dict) else {}
+                part = types.Part.from_function_call(
+                    name=func_name,
+                    args=func_args
+                )
+                if part.function_call:
+                    part.function_call.id = f"call_{next(_CALL_ID):08x}"
+                logger.debug(
+                    "Converted type:function text to proper function call: %s", func_name)
+                return part
+
+            # Check if it looks like a simple function call with "name" and "parameters"
+            elif 'name' in data and 'parameters' in data:
+                func_name = data['name']
+                func_args = data['parameters'] if isinstance(
+                    data['parameters'], dict) else {}
+
+                part = types.Part.from_function_call(
+                    name=func_name,
+                    args=func_args
+                )
+                if part.function_call:
+                    part.function_call.id = f"call_{next(_CALL_ID):08x}"
+                logger.debug(
+                    "Converted name/parameters text to proper function call: %s", func_name)
+                return part
+
+            # Check for nested function call format
+            elif 'function' in data and isinstance(data['function'], dict):
+                func_data = data['function']
+                if 'name' in func_data:
+                    func_name = func_data['name']
+                    func_args = func_data.get('parameters', {})
+                    if isinstance(func_args, str):
+                        try:
+                            func_args = _json_loads(func_args)
+                        except json.JSONDecodeError:
+                            func_args = {}
 
                     part = types.Part.from_function_call(
                         name=func_name,
                         args=func_args
                     )
                     if part.function_call:
-                        part.function_call.id = f"call_{hash(content) % 10000}"
+                        part.function_call.id = f"call_{next(_CALL_ID):08x}"
                     logger.debug(
-                        f"Converted name/parameters text to proper function call: {func_name}")
+                        "Converted nested text function call to proper function call: %s", func_name)
                     return part
 
-                # Check for nested function call format
-                elif 'function' in data and isinstance(data['function'], dict):
-                    func_data = data['function']
-                    if 'name' in func_data:
-                        func_name = func_data['name']
-                        func_args = func_data.get('parameters', {})
-                        if isinstance(func_args, str):
-                            try:
-                                func_args = json.loads(func_args)
-                            except json.JSONDecodeError:
-                                func_args = {}
-
-                        part = types.Part.from_function_call(
-                            name=func_name,
-                            args=func_args
-                        )
-                        if part.function_call:
-                            part.function_call.id = f"call_{hash(content) % 10000}"
-                        logger.debug(
-                            f"Converted nested text function call to proper function call: {func_name}")
-                        return part
-
         except (json.JSONDecodeError, KeyError, TypeError) as e:
-            logger.debug(f"Content is not a function call: {e}")
+            logger.debug("Content is not a function call: %s", e)
 
         return None
 
-    def _looks_like_function_call_in_progress(self, content: str) -> bool:
-        """Check if the accumulated content looks like a function call in progress.
+    def _detect_function_call_mode(self, content: str) -> Optional[bool]:
+        """Decide from the start of a streamed reply whether it is a function call.
 
-        This helps prevent showing raw JSON or premature results during streaming.
+        Returns None while the leading text could still open a function-call
+        JSON object, so callers hold tokens back only until this is settled
+        instead of rescanning the whole accumulated reply on every token.
         """
-        content_stripped = content.strip()
-
-        # Check if it starts with function call JSON patterns
-        if content_stripped.startswith('{"name"') or content_stripped.startswith('{"type"'):
-            return True
-
-        # Check if it contains function call patterns but isn't complete yet
-        if '{"name"' in content_stripped or '{"type"' in content_stripped:
+        head = content.lstrip()[:_FUNCTION_CALL_MARKER_LEN]
+        if not head:
+            return None
+        if head.startswith(_FUNCTION_CALL_MARKERS):
             return True
-
+        if any(marker.startswith(head) for marker in _FUNCTION_CALL_MARKERS):
+            return None
         return False
 
-    async def _make_raw_http_request_async(self, api_params: Dict[str, Any]) -> LlmResponse:
-        """Make an async raw HTTP request when OpenAI client fails."""
+    async def _make_raw_http_request_async(self, api_params: Dict[str, Any]) -> AsyncGenerator[LlmResponse, None]:
+        """Make an async raw HTTP request when OpenAI client fails.
+
+        The body is read line by line. If the server answers with SSE ``data:``
+        frames, their text deltas are collected into the single final
+        response; otherwise the body is parsed as JSON.
+        """
         try:
             url = f"{self.base_url or 'http://localhost:4000/v1'}/chat/completions"
             headers = {
@@ -395,83 +624,95 @@ class TransformersLlm(BaseLlm):
                 "Authorization": f"Bearer {self.api_key or 'random_string'}"
             }
 
-            # Ensure stream is False for non-streaming
-            api_params["stream"] = False
-
             # Check if there are function responses in the messages
             messages = api_params.get("messages", [])
             has_function_responses = any(
                 msg.get("role") == "tool" for msg in messages
             )
             logger.debug(
-                f"Async function response detection: has_function_responses={has_function_responses}, message_count={len(messages)}")
-
-            # Use asyncio to run the synchronous requests call
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.post(
-                    url, json=api_params, headers=headers, timeout=self.timeout)
-            )
-            response.raise_for_status()
-            response_text = response.text.strip()
+                "Async function response detection: has_function_responses=%s, message_count=%d",
+                has_function_responses, len(messages))
+
+            async with self._http_client.stream(
+                    "POST", url, json=api_params, headers=headers) as response:
+                response.raise_for_status()
+
+                # Decided from the first non-empty line: SSE frames or a JSON body
+                is_streaming = None
+                body_lines = []
+                content_parts = []
+
+                async for line in _aiter_byte_lines(response):
+                    if is_streaming is None:
+                        if not line.strip():
+                            continue
+                        is_streaming = line.lstrip().startswith(b"data:")
+
+                    if not is_streaming:
+                        body_lines.append(line)
+                        continue
 
-            # Check if response is streaming format (starts with "data:")
-            if response_text.startswith("data:"):
-                # Parse streaming response manually
-                return self._parse_raw_streaming_response(response_text, has_function_responses)
+                    # Non-streaming callers expect exactly one response, so
+                    # deltas are only collected here
+                    content = self._parse_raw_streaming_line(line.strip())
+                    if content:
+                        content_parts.append(content)
+
+            if is_streaming:
+                yield self._parse_raw_streaming_response(content_parts, has_function_responses)
             else:
                 # Parse as JSON
-                response_data = response.json()
-                return self._convert_raw_response_to_llm_response(response_data, has_function_responses)
+                response_data = _json_loads(b"\n".join(body_lines))
+                yield self._convert_raw_response_to_llm_response(response_data, has_function_responses)
 
         except Exception as e:
             logger.error(f"Async raw HTTP request failed: {e}")
-            return LlmResponse(
+            yield LlmResponse(
                 error_code="ASYNC_RAW_HTTP_ERROR",
                 error_message=str(e)
             )
 
     def _convert_contents_to_messages(self, contents: List[types.Content]) -> List[Dict[str, Any]]:
         """Converts ADK Content objects to Transformers message format."""
-        messages = []
-
-        for content in contents:
-            # Handle function responses as tool messages
-            if content.parts and any(part.function_response for part in content.parts):
-                for part in content.parts:
-                    if part.function_response:
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": part.function_response.id,
-                            "content": json.dumps(part.function_response.response)
-                        })
-            else:
-                # Regular user/assistant messages
-                message = {
-                    "role": self._convert_role(content.role),
-                    "content": self._convert_parts_to_content(content.parts or [])
-                }
+        return list(itertools.chain.from_iterable(
+            map(self._content_to_messages, contents)))
+
+    def _content_to_messages(self, content: types.Content) -> Iterator[Dict[str, Any]]:
+        """Yields the Transformers messages for a single ADK Content."""
+        # Handle function responses as tool messages
+        if content.parts and any(part.function_response for part in content.parts):
+            for part in content.parts:
+                if part.function_response:
+                    yield {
+                        "role": "tool",
+                        "tool_call_id": part.function_response.id,
+                        "content": _json_dumps(part.function_response.response)
+                    }
+            return
 
-                # Add tool calls for assistant messages
-                if content.role in ["model", "assistant"] and content.parts:
-                    tool_calls = []
-                    for part in content.parts:
-                        if part.function_call:
-                            tool_calls.append({
-                                "id": part.function_call.id,
-                                "type": "function",
-                                "function": {
-                                    "name": part.function_call.name,
-                                    "arguments": json.dumps(part.function_call.args)
-                                }
-                            })
-                    if tool_calls:
-                        message["tool_calls"] = tool_calls
+        # Regular user/assistant messages
+        message = {
+            "role": self._convert_role(content.role),
+            "content": self._convert_parts_to_content(content.parts or [])
+        }
 
-                messages.append(message)
+        # Add tool calls for assistant messages
+        if content.role in ["model", "assistant"] and content.parts:
+            tool_calls = [
+                {
+                    "id": part.function_call.id,
+                    "type": "function",
+                    "function": {
+                        "name": part.function_call.name,
+                        "arguments": _json_dumps(part.function_call.args)
+                    }
+                }
+                for part in content.parts if part.function_call
+            ]
+            if tool_calls:
+                message["tool_calls"] = tool_calls
 
-        return messages
+        yield message
 
     def _convert_role(self, role: Optional[str]) -> str:
         """Converts ADK role to Transformers role."""
@@ -486,53 +727,15 @@ class TransformersLlm(BaseLlm):
 
     def _convert_parts_to_content(self, parts: List[types.Part]) -> Any:
         """Converts ADK Parts to Transformers content format."""
-        content_parts = []
-
-        for part in parts:
-            if part.text:
-                content_parts.append({
-                    "type": "text",
-                    "text": part.text
-                })
-            elif part.inline_data and part.inline_data.mime_type and part.inline_data.data:
-                if part.inline_data.mime_type.startswith("image"):
-                    # Handle image data
-                    import base64
-                    base64_data = base64.b64encode(
-                        part.inline_data.data).decode()
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:{part.inline_data.mime_type};base64,{base64_data}"
-                        }
-                    })
-                elif part.inline_data.mime_type.startswith("audio"):
-                    # Handle audio data (for models that support it)
-                    import base64
-                    base64_data = base64.b64encode(
-                        part.inline_data.data).decode()
-                    content_parts.append({
-                        "type": "input_audio",
-                        "input_audio": {
-                            "data": base64_data,
-                            "format": part.inline_data.mime_type.split("/")[-1]
-                        }
-                    })
-            elif part.file_data and part.file_data.file_uri:
-                # Handle image URLs directly
-                if part.file_data.file_uri.startswith(("http://", "https://")):
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": part.file_data.file_uri
-                        }
-                    })
-                else:
-                    # Handle other file references as text
-                    content_parts.append({
-                        "type": "text",
-                        "text": f"[File: {part.file_data.file_uri}]"
-                    })
+        # Fast path for the common plain-text turn; text takes precedence over
+        # inline/file data in _convert_part, so this matches the general path
+        if len(parts) == 1 and parts[0].text:
+            return parts[0].text
+
+        content_parts = [
+            content_part for content_part in map(self._convert_part, parts)
+            if content_part is not None
+        ]
 
         # Return single text if only one text part, otherwise return array
         if len(content_parts) == 1 and content_parts[0]["type"] == "text":
@@ -540,6 +743,32 @@ class TransformersLlm(BaseLlm):
 
         return content_parts if content_parts else ""
 
+    def _convert_part(self, part: types.Part) -> Optional[Dict[str, Any]]:
+        """Converts a single ADK Part to a Transformers content part, if supported."""
+        if part.text:
+            return {
+                "type": "text",
+                "text": part.text
+            }
+        elif part.inline_data and part.inline_data.mime_type and part.inline_data.data:
+            return _convert_inline_data(
+                part.inline_data.mime_type, part.inline_data.data)
+        elif part.file_data and part.file_data.file_uri:
+            # Handle image URLs directly
+            if part.file_data.file_uri.startswith(("http://", "https://")):
+                return {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": part.file_data.file_uri
+                    }
+                }
+            # Handle other file references as text
+            return {
+                "type": "text",
+                "text": f"[File: {part.file_data.file_uri}]"
+            }
+        return None
+
     def _convert_tools(self, llm_request: LlmRequest) -> Optional[List[Dict[str, Any]]]:
         """Converts ADK tools to Transformers tools format."""
         if not llm_request.config.tools:
@@ -585,24 +814,29 @@ class TransformersLlm(BaseLlm):
         """Converts ADK Schema to Transformers JSON schema format."""
         result = {}
 
-        if schema.type:
-            result["type"] = schema.type.value.lower() if hasattr(
-                schema.type, 'value') else str(schema.type).lower()
+        # Walk nested properties/items with an explicit stack of (source, target) pairs
+        stack = [(schema, result)]
+        while stack:
+            src, dst = stack.pop()
 
-        if schema.description:
-            result["description"] = schema.description
+            if src.type:
+                dst["type"] = _type_name(src.type)
 
-        if schema.properties:
-            result["properties"] = {
-                name: self._convert_schema(prop_schema)
-                for name, prop_schema in schema.properties.items()
-            }
+            if src.description:
+                dst["description"] = src.description
 
-        if schema.items:
-            result["items"] = self._convert_schema(schema.items)
+            if src.properties:
+                properties = dst["properties"] = {}
+                for name, prop_schema in src.properties.items():
+                    properties[name] = child = {}
+                    stack.append((prop_schema, child))
 
-        if schema.enum:
-            result["enum"] = schema.enum
+            if src.items:
+                dst["items"] = child = {}
+                stack.append((src.items, child))
+
+            if src.enum:
+                dst["enum"] = src.enum
 
         return result
 
@@ -628,56 +862,113 @@ class TransformersLlm(BaseLlm):
 
     async def _stream_completion(self, api_params: Dict[str, Any]) -> AsyncGenerator[LlmResponse, None]:
         """Handles streaming completion from Transformers."""
-        accumulated_content = ""
+        # Streamed text pieces, joined only where the full text is needed
+        content_chunks: List[str] = []
         accumulated_tool_calls = {}
         tokens_yielded = False  # Track if we've yielded any tokens
+        fc_mode: Optional[bool] = None  # Whether the reply is a function call, once known
         final_response_yielded = False  # Track if we've yielded the final response
+        # Text tokens coalesced into one partial response per batch
+        pending_tokens: List[str] = []
+        loop = asyncio.get_running_loop()
+        last_flush = loop.time()
+
+        # Bind per-chunk lookups to locals once, outside the streaming loop
+        clock = loop.time
+        batch_size = self.stream_batch_size
+        batch_interval = self.stream_batch_interval
+        partial_text_response = self._partial_text_response
+        convert_finish_reason = self._convert_finish_reason
+        part_construct = types.Part.model_construct
+        function_call_construct = types.FunctionCall.model_construct
+        finish_stop = types.FinishReason.STOP
+        # Read in flight while tokens are held, kept across window timeouts
+        next_chunk: Optional[asyncio.Future] = None
 
         try:
             # Create streaming completion
             stream = await self._transformers_client.chat.completions.create(**api_params)
 
-            async for chunk in stream:
-                # Handle the case where chunk might be a string or have different structure
-                if isinstance(chunk, str):
-                    # If chunk is a string, treat it as content
-                    accumulated_content += chunk
-                    yield LlmResponse(
-                        content=types.Content(
-                            role="model",
-                            parts=[types.Part(text=chunk)]
-                        ),
-                        partial=True
-                    )
-                    continue
+            chunks = aiter(stream)
+            while True:
+                if next_chunk is None and not pending_tokens:
+                    chunk = await anext(chunks, _STREAM_END)
+                else:
+                    if next_chunk is None:
+                        next_chunk = asyncio.ensure_future(anext(chunks, _STREAM_END))
+                    if pending_tokens:
+                        # Held tokens wait at most until the batch window closes,
+                        # even if the server pauses before the next chunk
+                        done, _ = await asyncio.wait(
+                            (next_chunk,), timeout=max(0.0, last_flush + batch_interval - clock()))
+                        if not done:
+                            yield partial_text_response("".join(pending_tokens))
+                            pending_tokens.clear()
+                            last_flush = clock()
+                            continue
+                    chunk = await next_chunk
+                    next_chunk = None
+                if chunk is _STREAM_END:
+                    break
 
                 # Handle standard Transformers chunk format
-                if not hasattr(chunk, 'choices') or not chunk.choices:
+                choices = getattr(chunk, 'choices', None)
+                if not choices:
+                    # Handle the case where chunk might be a string or have different structure
+                    if isinstance(chunk, str):
+                        # If chunk is a string, treat it as content
+                        content_chunks.append(chunk)
+                        first_visible = fc_mode is None
+                        if first_visible:
+                            # Raw strings are always shown, so release anything held back
+                            fc_mode = False
+                            chunk = "".join(content_chunks)
+                        pending_tokens.append(chunk)
+                        if (first_visible or len(pending_tokens) >= batch_size
+                                or clock() - last_flush >= batch_interval):
+                            yield partial_text_response("".join(pending_tokens))
+                            pending_tokens.clear()
+                            last_flush = clock()
                     continue
 
-                choice = chunk.choices[0]
+                choice = choices[0]
                 delta = choice.delta
 
-                # Handle text content - yield each token as it comes
-                if hasattr(delta, 'content') and delta.content:
-                    token = delta.content
-                    accumulated_content += token
+                # Handle text content - yield tokens in small batches as they come
+                content = getattr(delta, 'content', None)
+                if content:
+                    token = content
+                    content_chunks.append(token)
 
-                    # Don't yield tokens if the accumulated content looks like a function call
+                    # Don't yield tokens if the reply turns out to be a function call
                     # This prevents showing raw JSON or premature results before function execution
-                    if not self._looks_like_function_call_in_progress(accumulated_content):
+                    first_visible = fc_mode is None
+                    if first_visible:
+                        # Only joined while undecided, which lasts a few tokens
+                        held_content = "".join(content_chunks)
+                        fc_mode = self._detect_function_call_mode(held_content)
+                        # Release everything held back while undecided
+                        token = held_content
+                    if fc_mode is False:
                         tokens_yielded = True  # Mark that we've yielded tokens
-                        yield LlmResponse(
-                            content=types.Content(
-                                role="model",
-                                parts=[types.Part(text=token)]
-                            ),
-                            partial=True
-                        )
+                        pending_tokens.append(token)
+                        # The first visible text is never batched
+                        if (first_visible or len(pending_tokens) >= batch_size
+                                or clock() - last_flush >= batch_interval):
+                            yield partial_text_response("".join(pending_tokens))
+                            pending_tokens.clear()
+                            last_flush = clock()
 
                 # Handle tool calls (accumulate for final response)
-                if hasattr(delta, 'tool_calls') and delta.tool_calls:
-                    for tool_call in delta.tool_calls:
+                tool_calls = getattr(delta, 'tool_calls', None)
+                if tool_calls:
+                    # Text before a tool call shouldn't wait out the argument stream
+                    if pending_tokens:
+                        yield partial_text_response("".join(pending_tokens))
+                        pending_tokens.clear()
+                        last_flush = clock()
+
+                    for tool_call in tool_calls:
                         if tool_call.index not in accumulated_tool_calls:
                             accumulated_tool_calls[tool_call.index] = {
                                 "id": tool_call.id or "",
@@ -692,88 +983,153 @@ class TransformersLlm(BaseLlm):
                             accumulated_tool_calls[tool_call.index]["arguments"] += tool_call.function.arguments
 
                 # Handle completion
-                if hasattr(choice, 'finish_reason') and choice.finish_reason:
+                finish_reason = getattr(choice, 'finish_reason', None)
+                if finish_reason:
                     parts = []
 
+                    # Flush any batched tokens before the final response
+                    if pending_tokens:
+                        yield partial_text_response("".join(pending_tokens))
+                        pending_tokens.clear()
+
                     # Check if we have accumulated content that looks like a function call
+                    accumulated_content = "".join(content_chunks)
                     if accumulated_content:
                         function_call_part = self._try_parse_function_call_from_text(
                             accumulated_content, allow_conversion=True)
                         if function_call_part:
                             # This is a function call - yield it as a function call response
                             yield LlmResponse(
-                                content=types.Content(role="model", parts=[
-                                                      function_call_part]),
-                                finish_reason=self._convert_finish_reason(
-                                    choice.finish_reason)
+                                content=_make_content([function_call_part]),
+                                finish_reason=convert_finish_reason(
+                                    finish_reason)
                             )
                             final_response_yielded = True
                             # Don't yield regular text content if we yielded a function call
-                            accumulated_content = ""
+                            content_chunks.clear()
                             # Reset tokens_yielded so subsequent natural language responses can be yielded
                             tokens_yielded = False
+                            fc_mode = None
 
                     # Handle tool calls from proper tool_calls format
-                    for tool_call_data in accumulated_tool_calls.values():
-                        if tool_call_data["name"]:
-                            try:
-                                args = json.loads(
-                                    tool_call_data["arguments"]) if tool_call_data["arguments"] else {}
-                            except json.JSONDecodeError:
-                                args = {}
-
-                            part = types.Part.from_function_call(
-                                name=tool_call_data["name"],
-                                args=args
-                            )
-                            if part.function_call:
-                                part.function_call.id = tool_call_data["id"]
-                            parts.append(part)
+                    # Snapshot the accumulated calls once; nameless buffers are skipped
+                    # before any argument decoding
+                    for tool_call_data in list(accumulated_tool_calls.values()):
+                        name = tool_call_data["name"]
+                        if not name:
+                            continue
+                        args = _safe_json_args(tool_call_data["arguments"])
+
+                        # Name, id and args are already str/str/dict, so skip validation
+                        function_call = function_call_construct(
+                            id=tool_call_data["id"],
+                            name=name,
+                            args=args
+                        )
+                        parts.append(part_construct(
+                            function_call=function_call))
 
                     # Yield tool calls if we have them
                     if parts:
                         yield LlmResponse(
-                            content=types.Content(role="model", parts=parts),
-                            finish_reason=self._convert_finish_reason(
-                                choice.finish_reason)
+                            content=_make_content(parts),
+                            finish_reason=convert_finish_reason(
+                                finish_reason)
                         )
                         final_response_yielded = True
                     # Don't yield final text response if we've already streamed tokens
                     # The streaming tokens already provide the content to the frontend
                     # We only need the final response for session persistence, which is handled by the fallback
 
+            if pending_tokens:
+                yield partial_text_response("".join(pending_tokens))
+                pending_tokens.clear()
+
             # Always yield final response for session persistence if we have content
             # The frontend deduplication will handle any display issues
+            accumulated_content = "".join(content_chunks)
             if not final_response_yielded and accumulated_content:
                 logger.info(
-                    f"Yielding final response for session persistence: {accumulated_content[:50]}...")
+                    "Yielding final response for session persistence: %s...", accumulated_content[:50])
                 yield LlmResponse(
-                    content=types.Content(role="model", parts=[
-                                          types.Part(text=accumulated_content)]),
-                    finish_reason=types.FinishReason.STOP
+                    content=_make_content(
+                        [part_construct(text=accumulated_content)]),
+                    finish_reason=finish_stop
                 )
 
-        except Exception as e:
-            logger.error(f"Error in streaming completion: {e}")
-            # Always yield accumulated content for session persistence
-            if accumulated_content:
-                yield LlmResponse(
-                    content=types.Content(
-                        role="model",
-                        parts=[types.Part(text=accumulated_content)]
-                    ),
-                    finish_reason=types.FinishReason.STOP
-                )
+        except (openai.OpenAIError, httpx.HTTPError, ValueError, RuntimeError,
+                AttributeError, TypeError, KeyError) as e:
+            # Malformed chunks land here too, so text already streamed to the
+            # user still reaches the session
+            logger.error("Error in streaming completion: %s", e)
+            # Always yield accumulated content for session persistence;
+            # with nothing accumulated there is nothing to build
+            accumulated_content = "".join(content_chunks)
+            if not accumulated_content:
+                return
+            yield LlmResponse.model_construct(
+                content=_make_content(
+                    [part_construct(text=accumulated_content)]),
+                finish_reason=finish_stop
+            )
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+
+    async def _generate_content_text(self, api_params: Dict[str, Any]) -> LlmResponse:
+        """Collects a tool-free completion and returns it as one response."""
+        api_params["stream"] = True
+        content_chunks: List[str] = []
+        finish_reason = None
+
+        stream = await self._transformers_client.chat.completions.create(**api_params)
+        async for chunk in stream:
+            choices = getattr(chunk, 'choices', None)
+            if not choices:
+                if isinstance(chunk, str):
+                    content_chunks.append(chunk)
+                continue
+            choice = choices[0]
+            content = getattr(choice.delta, 'content', None)
+            if content:
+                content_chunks.append(content)
+            # Only the terminal chunk's reason matters, so it is converted once below
+            finish_reason = getattr(choice, 'finish_reason', None) or finish_reason
+
+        full_content = "".join(content_chunks)
+        if not full_content:
+            return LlmResponse(
+                error_code="NO_CONTENT",
+                error_message="No content found in streaming response"
+            )
+
+        # The model may still answer with a function call written out as text
+        has_function_responses = any(
+            msg.get("role") == "tool" for msg in api_params["messages"])
+        part = self._try_parse_function_call_from_text(
+            full_content, allow_conversion=not has_function_responses)
+        if part is None:
+            part = types.Part.model_construct(text=full_content)
+        return LlmResponse.model_construct(
+            content=_make_content([part]),
+            finish_reason=(self._convert_finish_reason(finish_reason)
+                           if finish_reason else types.FinishReason.STOP)
+        )
+
+    def _partial_text_response(self, text: str) -> LlmResponse:
+        """Builds a partial streaming response carrying ``text``.
+
+        All three models are built with ``model_construct`` since the values
+        are already well-typed, skipping per-chunk validation. Terminal
+        responses whose fields are equally well-typed (the streaming error
+        fallback and the collapsed text reply) skip it too; the rest are
+        validated.
+        """
+        return LlmResponse.model_construct(
+            content=_make_content([types.Part.model_construct(text=text)]),
+            partial=True
+        )
 
     def _convert_finish_reason(self, transformers_finish_reason: Optional[str]) -> Optional[types.FinishReason]:
         """Converts Transformers finish reason to ADK finish reason."""
-        if transformers_finish_reason == "stop":
-            return types.FinishReason.STOP
-        elif transformers_finish_reason == "length":
-            return types.FinishReason.MAX_TOKENS
-        elif transformers_finish_reason == "tool_calls":
-            return types.FinishReason.STOP
-        elif transformers_finish_reason == "content_filter":
-            return types.FinishReason.SAFETY
-        else:
-            return types.FinishReason.FINISH_REASON_UNSPECIFIED
+        return _FINISH_REASON_MAP.get(transformers_finish_reason, _FINISH_REASON_DEFAULT)